@@ -5,33 +5,48 @@ This demonstrates the "Tool-as-Guide" pattern where the tool (not the AI)
 controls the workflow through a state machine.
 """
 
-import uuid
+import secrets
+import time
+from collections import OrderedDict
 from typing import Dict, Optional, List
 from dataclasses import dataclass, field
 from datetime import datetime
+from enum import IntEnum
 
 
-@dataclass
+class State(IntEnum):
+    """Steps of the ordering workflow"""
+    START = 0
+    CHOOSE_CRUST = 1
+    CHOOSE_CATEGORY = 2
+    CHOOSE_TOPPINGS = 3
+    CHOOSE_SIZE = 4
+    CONFIRM = 5
+    COMPLETE = 6
+
+
+@dataclass(slots=True)
 class PizzaOrder:
     """Represents a pizza order in progress"""
     session_id: str
-    state: str = "START"
+    state: State = State.START
     crust: Optional[str] = None
     category: Optional[str] = None  # "vegetarian" or "meat"
     toppings: List[str] = field(default_factory=list)
     size: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at_ns: int = field(default_factory=time.time_ns)
+    touched_at_ns: int = field(default_factory=time.time_ns, repr=False)
     
     def to_dict(self) -> dict:
         """Convert order to dictionary"""
         return {
             "session_id": self.session_id,
-            "state": self.state,
+            "state": self.state.name,
             "crust": self.crust,
             "category": self.category,
             "toppings": self.toppings,
             "size": self.size,
-            "created_at": self.created_at.isoformat()
+            "created_at": datetime.fromtimestamp(self.created_at_ns / 1e9).isoformat()
         }
 
 
@@ -57,8 +72,45 @@ class PizzaOrderGuide:
         "Chicken", "Ground Beef", "Salami"
     ]
     
+    # Session retention: least recently used orders are evicted past
+    # MAX_SESSIONS, and orders idle longer than SESSION_TTL_NS expire on access
+    MAX_SESSIONS = 10_000
+    SESSION_TTL_NS = 60 * 60 * 1_000_000_000  # one hour
+    
+    # Lowercased lookups for option matching, built once at import
+    _CRUST_LOOKUP = {c.lower(): c for c in CRUSTS}
+    _SIZE_LOOKUP = {s.lower(): s for s in SIZES}
+    _VEGETARIAN_LOOKUP = {t.lower(): t for t in VEGETARIAN_TOPPINGS}
+    _MEAT_LOOKUP = {t.lower(): t for t in MEAT_TOPPINGS}
+    
+    # Fixed prompts built once at import
+    _CRUSTS_TEXT = ", ".join(CRUSTS)
+    _SIZES_TEXT = ", ".join(SIZES)
+    _START_PROMPT = f"Great! Let's build your perfect pizza. What kind of crust would you like?\n\nOptions: {_CRUSTS_TEXT}"
+    _CRUST_RETRY_PROMPT = f"I didn't catch that. Please choose from: {_CRUSTS_TEXT}"
+    _TOPPINGS_PROMPTS = {
+        category: f"Great choice! Here are your {category} topping options:\n\n{', '.join(toppings)}\n\nPlease list the toppings you'd like (e.g., 'Mushrooms, Olives, Bell Peppers')"
+        for category, toppings in (("vegetarian", VEGETARIAN_TOPPINGS), ("meat", MEAT_TOPPINGS))
+    }
+    _TOPPINGS_RETRY_PROMPTS = {
+        category: f"I didn't recognize any of those toppings. Please choose from: {', '.join(toppings)}"
+        for category, toppings in (("vegetarian", VEGETARIAN_TOPPINGS), ("meat", MEAT_TOPPINGS))
+    }
+    _SIZE_RETRY_PROMPT = f"Please choose from: {_SIZES_TEXT}"
+    
     def __init__(self):
-        self.sessions: Dict[str, PizzaOrder] = {}
+        self.sessions: OrderedDict[str, PizzaOrder] = OrderedDict()
+        
+        # Handler per state, indexed by State value (None = no handler)
+        self._handlers = (
+            None,                            # START
+            self._handle_crust_choice,       # CHOOSE_CRUST
+            self._handle_category_choice,    # CHOOSE_CATEGORY
+            self._handle_toppings_choice,    # CHOOSE_TOPPINGS
+            self._handle_size_choice,        # CHOOSE_SIZE
+            self._handle_confirmation,       # CONFIRM
+            None,                            # COMPLETE
+        )
     
     def start_order(self) -> dict:
         """
@@ -66,15 +118,17 @@ class PizzaOrderGuide:
         
         Returns instructions for the AI host on what to do next.
         """
-        session_id = str(uuid.uuid4())[:8]
-        order = PizzaOrder(session_id=session_id, state="CHOOSE_CRUST")
+        session_id = secrets.token_hex(4)
+        order = PizzaOrder(session_id=session_id, state=State.CHOOSE_CRUST)
+        while len(self.sessions) >= self.MAX_SESSIONS:
+            self.sessions.popitem(last=False)
         self.sessions[session_id] = order
         
         return {
             "status": "in_progress",
             "session_id": session_id,
             "action": "ask_user",
-            "prompt": f"Great! Let's build your perfect pizza. What kind of crust would you like?\n\nOptions: {', '.join(self.CRUSTS)}",
+            "prompt": self._START_PROMPT,
             "next_state": "CHOOSE_CRUST",
             "instructions_for_ai": "Ask the user this exact question and wait for their response."
         }
@@ -86,54 +140,42 @@ class PizzaOrderGuide:
         This is where the state machine logic lives. The AI doesn't decide
         what to ask next - the guide does.
         """
-        if session_id not in self.sessions:
+        order = self._get_live_order(session_id)
+        if order is None:
             return {
                 "status": "error",
                 "message": f"Session {session_id} not found. Please start a new order."
             }
         
-        order = self.sessions[session_id]
         user_response = user_response.strip()
         
         # State machine logic
-        if order.state == "CHOOSE_CRUST":
-            return self._handle_crust_choice(order, user_response)
-        
-        elif order.state == "CHOOSE_CATEGORY":
-            return self._handle_category_choice(order, user_response)
-        
-        elif order.state == "CHOOSE_TOPPINGS":
-            return self._handle_toppings_choice(order, user_response)
-        
-        elif order.state == "CHOOSE_SIZE":
-            return self._handle_size_choice(order, user_response)
-        
-        elif order.state == "CONFIRM":
-            return self._handle_confirmation(order, user_response)
-        
-        else:
+        handler = self._handlers[order.state]
+        if handler is None:
             return {
                 "status": "error",
-                "message": f"Unknown state: {order.state}"
+                "message": f"Unknown state: {order.state.name}"
             }
+        
+        return handler(order, user_response)
     
     def _handle_crust_choice(self, order: PizzaOrder, response: str) -> dict:
         """Handle crust selection and move to category"""
         # Simple matching - in production you'd use better NLP
-        crust = self._match_option(response, self.CRUSTS)
+        crust = self._match_option(response, self._CRUST_LOOKUP)
         
         if not crust:
             return {
                 "status": "in_progress",
                 "session_id": order.session_id,
                 "action": "ask_user",
-                "prompt": f"I didn't catch that. Please choose from: {', '.join(self.CRUSTS)}",
+                "prompt": self._CRUST_RETRY_PROMPT,
                 "stay_in_state": True,
                 "instructions_for_ai": "The user's response was unclear. Ask them to choose from the listed options."
             }
         
         order.crust = crust
-        order.state = "CHOOSE_CATEGORY"
+        order.state = State.CHOOSE_CATEGORY
         
         return {
             "status": "in_progress",
@@ -163,13 +205,13 @@ class PizzaOrderGuide:
                 "stay_in_state": True
             }
         
-        order.state = "CHOOSE_TOPPINGS"
+        order.state = State.CHOOSE_TOPPINGS
         
         return {
             "status": "in_progress",
             "session_id": order.session_id,
             "action": "ask_user",
-            "prompt": f"Great choice! Here are your {order.category} topping options:\n\n{', '.join(toppings)}\n\nPlease list the toppings you'd like (e.g., 'Mushrooms, Olives, Bell Peppers')",
+            "prompt": self._TOPPINGS_PROMPTS[order.category],
             "next_state": "CHOOSE_TOPPINGS",
             "available_toppings": toppings,
             "instructions_for_ai": "Show the user the topping options and wait for their selection."
@@ -178,7 +220,7 @@ class PizzaOrderGuide:
     def _handle_toppings_choice(self, order: PizzaOrder, response: str) -> dict:
         """Handle topping selection and move to size"""
         # Get available toppings based on category
-        available = self.VEGETARIAN_TOPPINGS if order.category == "vegetarian" else self.MEAT_TOPPINGS
+        available = self._VEGETARIAN_LOOKUP if order.category == "vegetarian" else self._MEAT_LOOKUP
         
         # Simple parsing - split by comma or "and"
         parts = response.replace(" and ", ",").split(",")
@@ -186,7 +228,7 @@ class PizzaOrderGuide:
         
         for part in parts:
             topping = self._match_option(part.strip(), available)
-            if topping:
+            if topping and topping not in selected_toppings:
                 selected_toppings.append(topping)
         
         if not selected_toppings:
@@ -194,38 +236,37 @@ class PizzaOrderGuide:
                 "status": "in_progress",
                 "session_id": order.session_id,
                 "action": "ask_user",
-                "prompt": f"I didn't recognize any of those toppings. Please choose from: {', '.join(available)}",
+                "prompt": self._TOPPINGS_RETRY_PROMPTS[order.category],
                 "stay_in_state": True
             }
         
         order.toppings = selected_toppings
-        order.state = "CHOOSE_SIZE"
+        order.state = State.CHOOSE_SIZE
         
-        toppings_str = ", ".join(selected_toppings)
         return {
             "status": "in_progress",
             "session_id": order.session_id,
             "action": "ask_user",
-            "prompt": f"Excellent! Your pizza will have: {toppings_str}\n\nWhat size would you like?\n\nOptions: {', '.join(self.SIZES)}",
+            "prompt": f"Excellent! Your pizza will have: {', '.join(selected_toppings)}\n\nWhat size would you like?\n\nOptions: {self._SIZES_TEXT}",
             "next_state": "CHOOSE_SIZE",
             "instructions_for_ai": "Confirm their toppings and ask about size."
         }
     
     def _handle_size_choice(self, order: PizzaOrder, response: str) -> dict:
         """Handle size selection and move to confirmation"""
-        size = self._match_option(response, self.SIZES)
+        size = self._match_option(response, self._SIZE_LOOKUP)
         
         if not size:
             return {
                 "status": "in_progress",
                 "session_id": order.session_id,
                 "action": "ask_user",
-                "prompt": f"Please choose from: {', '.join(self.SIZES)}",
+                "prompt": self._SIZE_RETRY_PROMPT,
                 "stay_in_state": True
             }
         
         order.size = size
-        order.state = "CONFIRM"
+        order.state = State.CONFIRM
         
         # Generate order summary
         summary = self._generate_summary(order)
@@ -245,7 +286,7 @@ class PizzaOrderGuide:
         response_lower = response.lower()
         
         if "yes" in response_lower or "confirm" in response_lower or "looks good" in response_lower:
-            order.state = "COMPLETE"
+            order.state = State.COMPLETE
             summary = self._generate_summary(order)
             
             # In a real app, this would place the order
@@ -278,20 +319,45 @@ class PizzaOrderGuide:
 • Toppings: {toppings}
         """.strip()
     
-    def _match_option(self, user_input: str, options: List[str]) -> Optional[str]:
-        """Simple fuzzy matching for menu options"""
+    def _match_option(self, user_input: str, options: Dict[str, str]) -> Optional[str]:
+        """
+        Simple fuzzy matching for menu options.
+        
+        `options` maps lowercased option -> canonical option. An exact match
+        is a single dict probe; otherwise fall back to substring matching.
+        """
         user_input = user_input.lower().strip()
         
-        for option in options:
-            if option.lower() in user_input or user_input in option.lower():
+        option = options.get(user_input)
+        if option:
+            return option
+        
+        for option_lower, option in options.items():
+            if option_lower in user_input or user_input in option_lower:
                 return option
         
         return None
     
+    def _get_live_order(self, session_id: str) -> Optional[PizzaOrder]:
+        """Look up an order, dropping it if expired and marking it recently used"""
+        order = self.sessions.get(session_id)
+        if order is None:
+            return None
+        
+        now_ns = time.time_ns()
+        if now_ns - order.touched_at_ns > self.SESSION_TTL_NS:
+            del self.sessions[session_id]
+            return None
+        
+        order.touched_at_ns = now_ns
+        self.sessions.move_to_end(session_id)
+        return order
+    
     def get_order(self, session_id: str) -> Optional[dict]:
         """Get current order state"""
-        if session_id in self.sessions:
-            return self.sessions[session_id].to_dict()
+        order = self._get_live_order(session_id)
+        if order is not None:
+            return order.to_dict()
         return None
     
     def cancel_order(self, session_id: str) -> dict:
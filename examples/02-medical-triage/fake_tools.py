@@ -13,6 +13,7 @@ These tools simulate what a real medical system might have:
 
 from typing import Dict, List, Optional
 import random
+import re
 
 
 class SymptomClassifier:
@@ -134,34 +135,42 @@ class MedicalDatabase:
         }
     }
     
+    # Matches any cardiac-related keyword, case-insensitively
+    _CARDIAC_RE = re.compile(r"chest|pain|cardiac|heart", re.IGNORECASE)
+    
+    # Canned condition records returned by check_conditions
+    _HIGH_RISK_RECORD = {
+        "patient_id": "P001",
+        "chronic_conditions": ["hypertension", "high cholesterol"],
+        "cardiac_history": True,
+        "previous_mi": False,
+        "risk_factors": ["age > 50", "hypertension", "family history"],
+        "high_risk": True
+    }
+    _LOW_RISK_RECORD = {
+        "patient_id": "P002",
+        "chronic_conditions": [],
+        "cardiac_history": False,
+        "previous_mi": False,
+        "risk_factors": [],
+        "high_risk": False
+    }
+    
     def check_conditions(self, symptoms: str) -> Dict:
         """
         Check if patient has conditions related to symptoms.
         
         In demo, returns simulated data. In real system,
-        would query actual database.
+        would query actual database. The returned record is shared
+        between calls and must be treated as read-only.
         """
         # Simple simulation based on symptoms
-        if any(word in symptoms.lower() for word in ["chest", "pain", "cardiac", "heart"]):
+        if self._CARDIAC_RE.search(symptoms):
             # High-risk patient
-            return {
-                "patient_id": "P001",
-                "chronic_conditions": ["hypertension", "high cholesterol"],
-                "cardiac_history": True,
-                "previous_mi": False,
-                "risk_factors": ["age > 50", "hypertension", "family history"],
-                "high_risk": True
-            }
+            return self._HIGH_RISK_RECORD
         else:
             # Lower-risk patient
-            return {
-                "patient_id": "P002",
-                "chronic_conditions": [],
-                "cardiac_history": False,
-                "previous_mi": False,
-                "risk_factors": [],
-                "high_risk": False
-            }
+            return self._LOW_RISK_RECORD
     
     def check_allergies(self, patient_id: str = "P001") -> List[str]:
         """Check patient allergies"""
@@ -202,6 +211,106 @@ class VitalsMonitor:
     equipment (BP cuff, pulse oximeter, thermometer, etc.)
     """
     
+    # Canned vital signs per demo scenario, built once at import
+    
+    # Critical vitals (emergency)
+    _VITALS_CRITICAL = {
+        "blood_pressure": {
+            "systolic": 180,
+            "diastolic": 110,
+            "unit": "mmHg",
+            "status": "CRITICAL"
+        },
+        "heart_rate": {
+            "bpm": 120,
+            "unit": "bpm",
+            "status": "CRITICAL"
+        },
+        "respiratory_rate": {
+            "rate": 28,
+            "unit": "breaths/min",
+            "status": "ELEVATED"
+        },
+        "temperature": {
+            "value": 98.6,
+            "unit": "°F",
+            "status": "NORMAL"
+        },
+        "oxygen_saturation": {
+            "value": 92,
+            "unit": "%",
+            "status": "LOW"
+        },
+        "timestamp": "2024-11-11T16:30:00Z"
+    }
+    
+    # Elevated but not critical
+    _VITALS_ELEVATED = {
+        "blood_pressure": {
+            "systolic": 145,
+            "diastolic": 92,
+            "unit": "mmHg",
+            "status": "ELEVATED"
+        },
+        "heart_rate": {
+            "bpm": 95,
+            "unit": "bpm",
+            "status": "NORMAL"
+        },
+        "respiratory_rate": {
+            "rate": 18,
+            "unit": "breaths/min",
+            "status": "NORMAL"
+        },
+        "temperature": {
+            "value": 99.2,
+            "unit": "°F",
+            "status": "SLIGHTLY_ELEVATED"
+        },
+        "oxygen_saturation": {
+            "value": 96,
+            "unit": "%",
+            "status": "NORMAL"
+        },
+        "timestamp": "2024-11-11T16:30:00Z"
+    }
+    
+    _VITALS_NORMAL = {
+        "blood_pressure": {
+            "systolic": 120,
+            "diastolic": 80,
+            "unit": "mmHg",
+            "status": "NORMAL"
+        },
+        "heart_rate": {
+            "bpm": 72,
+            "unit": "bpm",
+            "status": "NORMAL"
+        },
+        "respiratory_rate": {
+            "rate": 16,
+            "unit": "breaths/min",
+            "status": "NORMAL"
+        },
+        "temperature": {
+            "value": 98.6,
+            "unit": "°F",
+            "status": "NORMAL"
+        },
+        "oxygen_saturation": {
+            "value": 98,
+            "unit": "%",
+            "status": "NORMAL"
+        },
+        "timestamp": "2024-11-11T16:30:00Z"
+    }
+    
+    _VITALS_BY_SCENARIO = {
+        "normal": _VITALS_NORMAL,
+        "elevated": _VITALS_ELEVATED,
+        "critical": _VITALS_CRITICAL
+    }
+    
     def get_vitals(self, patient_id: str = "P001", scenario: str = "normal") -> Dict:
         """
         Get patient vital signs.
@@ -211,102 +320,16 @@ class VitalsMonitor:
             scenario: "normal", "elevated", or "critical" for demo purposes
         
         Returns:
-            Dict with vital signs
+            Dict with vital signs (shared between calls, treat as read-only)
         """
-        if scenario == "critical":
-            # Critical vitals (emergency)
-            return {
-                "blood_pressure": {
-                    "systolic": 180,
-                    "diastolic": 110,
-                    "unit": "mmHg",
-                    "status": "CRITICAL"
-                },
-                "heart_rate": {
-                    "bpm": 120,
-                    "unit": "bpm",
-                    "status": "CRITICAL"
-                },
-                "respiratory_rate": {
-                    "rate": 28,
-                    "unit": "breaths/min",
-                    "status": "ELEVATED"
-                },
-                "temperature": {
-                    "value": 98.6,
-                    "unit": "°F",
-                    "status": "NORMAL"
-                },
-                "oxygen_saturation": {
-                    "value": 92,
-                    "unit": "%",
-                    "status": "LOW"
-                },
-                "timestamp": "2024-11-11T16:30:00Z"
-            }
-        
-        elif scenario == "elevated":
-            # Elevated but not critical
-            return {
-                "blood_pressure": {
-                    "systolic": 145,
-                    "diastolic": 92,
-                    "unit": "mmHg",
-                    "status": "ELEVATED"
-                },
-                "heart_rate": {
-                    "bpm": 95,
-                    "unit": "bpm",
-                    "status": "NORMAL"
-                },
-                "respiratory_rate": {
-                    "rate": 18,
-                    "unit": "breaths/min",
-                    "status": "NORMAL"
-                },
-                "temperature": {
-                    "value": 99.2,
-                    "unit": "°F",
-                    "status": "SLIGHTLY_ELEVATED"
-                },
-                "oxygen_saturation": {
-                    "value": 96,
-                    "unit": "%",
-                    "status": "NORMAL"
-                },
-                "timestamp": "2024-11-11T16:30:00Z"
-            }
-        
-        else:  # normal
-            return {
-                "blood_pressure": {
-                    "systolic": 120,
-                    "diastolic": 80,
-                    "unit": "mmHg",
-                    "status": "NORMAL"
-                },
-                "heart_rate": {
-                    "bpm": 72,
-                    "unit": "bpm",
-                    "status": "NORMAL"
-                },
-                "respiratory_rate": {
-                    "rate": 16,
-                    "unit": "breaths/min",
-                    "status": "NORMAL"
-                },
-                "temperature": {
-                    "value": 98.6,
-                    "unit": "°F",
-                    "status": "NORMAL"
-                },
-                "oxygen_saturation": {
-                    "value": 98,
-                    "unit": "%",
-                    "status": "NORMAL"
-                },
-                "timestamp": "2024-11-11T16:30:00Z"
-            }
+        return self._VITALS_BY_SCENARIO.get(scenario, self._VITALS_NORMAL)
+    
+    # (vital, status) -> critical finding, in reporting order
+    _CRITICAL_ALERTS = {
+        ("blood_pressure", "CRITICAL"): "Severely elevated blood pressure",
+        ("heart_rate", "CRITICAL"): "Tachycardia (elevated heart rate)",
+        ("oxygen_saturation", "LOW"): "Low oxygen saturation"
+    }
     
     def assess_vitals(self, vitals: Dict) -> List[str]:
         """
@@ -314,24 +337,11 @@ class VitalsMonitor:
         
         This is what the agent would do - analyze the data.
         """
-        critical_findings = []
-        
-        # Check BP
-        bp = vitals.get("blood_pressure", {})
-        if bp.get("status") == "CRITICAL":
-            critical_findings.append("Severely elevated blood pressure")
-        
-        # Check HR
-        hr = vitals.get("heart_rate", {})
-        if hr.get("status") == "CRITICAL":
-            critical_findings.append("Tachycardia (elevated heart rate)")
-        
-        # Check O2
-        o2 = vitals.get("oxygen_saturation", {})
-        if o2.get("status") == "LOW":
-            critical_findings.append("Low oxygen saturation")
-        
-        return critical_findings
+        return [
+            finding
+            for (vital, status), finding in self._CRITICAL_ALERTS.items()
+            if vitals.get(vital, {}).get("status") == status
+        ]
 
 
 class PatientInterviewSimulator:
@@ -363,6 +373,25 @@ class PatientInterviewSimulator:
         return scenario_data.get(question_type, "I don't know")
 
 
+# Shared tool instances and precomputed scenarios for get_demo_scenario
+_DB = MedicalDatabase()
+_VM = VitalsMonitor()
+
+_EMERGENCY_SCENARIO = {
+    "patient_response": "I have severe chest pain that started 30 minutes ago",
+    "db_data": _DB.check_conditions("chest pain"),
+    "vitals": _VM.get_vitals(scenario="critical"),
+    "scenario_name": "Cardiac Emergency"
+}
+
+_NORMAL_SCENARIO = {
+    "patient_response": "I have a mild headache",
+    "db_data": _DB.check_conditions("headache"),
+    "vitals": _VM.get_vitals(scenario="normal"),
+    "scenario_name": "Minor Complaint"
+}
+
+
 # Convenience function for demos
 def get_demo_scenario(scenario_type: str = "emergency"):
     """
@@ -372,20 +401,9 @@ def get_demo_scenario(scenario_type: str = "emergency"):
         scenario_type: "emergency" or "normal"
     
     Returns:
-        Dict with all simulated data for the scenario
+        Dict with all simulated data for the scenario (shared, read-only)
     """
     if scenario_type == "emergency":
-        return {
-            "patient_response": "I have severe chest pain that started 30 minutes ago",
-            "db_data": MedicalDatabase().check_conditions("chest pain"),
-            "vitals": VitalsMonitor().get_vitals(scenario="critical"),
-            "scenario_name": "Cardiac Emergency"
-        }
+        return _EMERGENCY_SCENARIO
     else:
-        return {
-            "patient_response": "I have a mild headache",
-            "db_data": MedicalDatabase().check_conditions("headache"),
-            "vitals": VitalsMonitor().get_vitals(scenario="normal"),
-            "scenario_name": "Minor Complaint"
-        }
-
+        return _NORMAL_SCENARIO
@@ -9,27 +9,156 @@ This demonstrates the "Tool-as-Guide" pattern where the guide (not the AI)
 controls the workflow through a state machine, ensuring protocol compliance.
 """
 
-import uuid
-from typing import Dict, Optional, List
+import functools
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, List, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
 
 
-class TriageLevel(Enum):
+# Audit entries kept per session; older entries are dropped first
+MAX_AUDIT_STEPS = 256
+
+
+# Response vocabulary, interned once and shared by every response dict
+STATUS_IN_PROGRESS = sys.intern("in_progress")
+STATUS_EMERGENCY_SAVE_REQUIRED = sys.intern("emergency_save_required")
+STATUS_EMERGENCY = sys.intern("emergency")
+STATUS_COMPLETE = sys.intern("complete")
+STATUS_CANCELLED = sys.intern("cancelled")
+STATUS_ERROR = sys.intern("error")
+
+DECISION_EMERGENCY_ESCALATION = sys.intern("EMERGENCY_ESCALATION")
+
+PROTOCOL_RED_FLAG_SCREENING = sys.intern("Emergency Department Triage Protocol - Red Flag Screening (Mandatory)")
+PROTOCOL_CHIEF_COMPLAINT = sys.intern("Standard Triage - Chief Complaint")
+PROTOCOL_MEDICAL_HISTORY = sys.intern("Standard Triage - Medical History Review")
+PROTOCOL_VITAL_SIGNS = sys.intern("Standard Triage - Vital Signs (Mandatory)")
+PROTOCOL_FINAL_ASSESSMENT = sys.intern("Final Triage Assessment")
+PROTOCOL_EMERGENCY_RECORD = sys.intern("Emergency Escalation Protocol - Record Saving")
+PROTOCOL_EMERGENCY_COMPLETE = sys.intern("Emergency Escalation Protocol - Complete")
+
+
+# Patient-facing message for every emergency escalation
+EMERGENCY_MESSAGE = (
+    "🚨 EMERGENCY: Based on your symptoms, you need immediate medical attention.\n\n"
+    "Please do ONE of the following RIGHT NOW:\n"
+    "1. Call 911 (or your local emergency number)\n"
+    "2. Go to the nearest Emergency Department\n"
+    "3. If with someone, have them drive you to the ER\n\n"
+    "Do NOT wait. Do NOT drive yourself if symptoms worsen."
+)
+
+# Static "in_progress" responses for each standard protocol step. Handlers
+# return a fresh dict built from the template with the session id filled in;
+# that copy is shallow, so nested values are immutable tuples.
+_RED_FLAG_SCREENING_RESPONSE = {
+    "status": STATUS_IN_PROGRESS,
+    "session_id": None,
+    "task": "screen_red_flags",
+    "instructions_for_agent": (
+        "CRITICAL: Before anything else, screen for emergency symptoms. This is mandatory protocol."
+    ),
+    "prompt": (
+        "Before we begin, I need to ask about any immediate concerns:\n\n"
+        "Are you experiencing any of the following RIGHT NOW:\n"
+        "- Severe chest pain or pressure\n"
+        "- Difficulty breathing or shortness of breath\n"
+        "- Loss of consciousness or fainting\n"
+        "- Severe bleeding\n"
+        "- Signs of stroke (face drooping, arm weakness, speech difficulty)\n"
+        "- Severe allergic reaction (swelling, difficulty swallowing)\n\n"
+        "Please answer yes or no, and describe any symptoms."
+    ),
+    "required_data": ("symptoms_present", "symptom_details"),
+    "protocol": PROTOCOL_RED_FLAG_SCREENING
+}
+
+_CHIEF_COMPLAINT_RESPONSE = {
+    "status": STATUS_IN_PROGRESS,
+    "session_id": None,
+    "task": "gather_chief_complaint",
+    "instructions_for_agent": (
+        "Red flag screening passed. Now gather the chief complaint. "
+        "Ask the patient what brought them in today."
+    ),
+    "prompt": "Thank you. Now, what brings you in today? What is the main issue you're experiencing?",
+    "required_data": ("chief_complaint", "symptom_description"),
+    "protocol": PROTOCOL_CHIEF_COMPLAINT
+}
+
+_MEDICAL_HISTORY_RESPONSE = {
+    "status": STATUS_IN_PROGRESS,
+    "session_id": None,
+    "task": "check_medical_history",
+    "instructions_for_agent": (
+        "Use available tools to check patient's medical history. "
+        "Look for: chronic conditions, medications, allergies, previous similar episodes. "
+        "This helps assess risk factors."
+    ),
+    "prompt": "I'm checking your medical history. Do you have any chronic conditions, take any medications, or have any allergies I should know about?",
+    "required_data": ("medical_history", "medications", "allergies"),
+    "protocol": PROTOCOL_MEDICAL_HISTORY
+}
+
+_VITAL_SIGNS_RESPONSE = {
+    "status": STATUS_IN_PROGRESS,
+    "session_id": None,
+    "task": "get_vital_signs",
+    "instructions_for_agent": (
+        "MANDATORY: Obtain vital signs. Use available monitoring tools. "
+        "Required: Blood pressure, heart rate, temperature, respiratory rate, oxygen saturation. "
+        "Flag any critical values immediately."
+    ),
+    "prompt": "Now I need to check your vital signs. This is a required step for proper assessment.",
+    "required_data": ("blood_pressure", "heart_rate", "temperature", "respiratory_rate", "oxygen_saturation"),
+    "protocol": PROTOCOL_VITAL_SIGNS
+}
+
+
+class TriageLevel(IntEnum):
     """Standard emergency triage levels"""
-    IMMEDIATE = "Level 1 - Immediate (Life-threatening)"
-    EMERGENCY = "Level 2 - Emergency (10 min)"
-    URGENT = "Level 3 - Urgent (30 min)"
-    SEMI_URGENT = "Level 4 - Semi-urgent (60 min)"
-    NON_URGENT = "Level 5 - Non-urgent (120 min)"
+    IMMEDIATE = 1
+    EMERGENCY = 2
+    URGENT = 3
+    SEMI_URGENT = 4
+    NON_URGENT = 5
+
+
+# Display labels indexed by TriageLevel
+_TRIAGE_LABELS = (
+    None,
+    "Level 1 - Immediate (Life-threatening)",
+    "Level 2 - Emergency (10 min)",
+    "Level 3 - Urgent (30 min)",
+    "Level 4 - Semi-urgent (60 min)",
+    "Level 5 - Non-urgent (120 min)",
+)
+
+
+class TriageState(IntEnum):
+    """Steps of the triage protocol"""
+    START = 0
+    RED_FLAG_SCREENING = 1
+    CHIEF_COMPLAINT = 2
+    MEDICAL_HISTORY = 3
+    VITAL_SIGNS = 4
+    SEVERITY_ASSESSMENT = 5
+    SAVE_RECORD = 6
+    EMERGENCY_ESCALATION = 7
+    COMPLETE = 8
 
 
-@dataclass
+@dataclass(slots=True)
 class TriageSession:
     """Represents a triage session in progress"""
     session_id: str
-    state: str = "START"
+    state: TriageState = TriageState.START
     
     # Red flag screening
     red_flags_checked: bool = False
@@ -50,30 +179,59 @@ class TriageSession:
     severity_score: int = 0
     triage_level: Optional[TriageLevel] = None
     recommendation: Optional[str] = None
+    final_message: Optional[str] = None
     
     # Audit trail
-    protocol_steps: List[Dict] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
+    protocol_steps: Deque[Tuple[str, int, Dict]] = field(
+        default_factory=lambda: deque(maxlen=MAX_AUDIT_STEPS)
+    )
+    created_at_ns: int = field(default_factory=time.time_ns)
+    _steps_cache: Optional[List[Dict]] = field(default=None, init=False, repr=False, compare=False)
     
     def add_step(self, step: str, data: Dict):
-        """Add a step to the audit trail"""
-        self.protocol_steps.append({
-            "step": step,
-            "timestamp": datetime.now().isoformat(),
-            "data": data
-        })
+        """Add a step to the audit trail (timestamp is formatted on read)"""
+        self.protocol_steps.append((step, time.time_ns(), data))
+        self._steps_cache = None
+    
+    def materialize_steps(self) -> List[Dict]:
+        """
+        Format the buffered audit trail as a list of step dicts.
+        
+        The result is cached until the next step is added, so repeated
+        reads of an unchanged trail do not re-format timestamps.
+        """
+        if self._steps_cache is None:
+            self._steps_cache = [
+                {
+                    "step": step,
+                    "timestamp": datetime.fromtimestamp(ts_ns / 1e9).isoformat(),
+                    "data": data
+                }
+                for step, ts_ns, data in self.protocol_steps
+            ]
+        return self._steps_cache
     
     def to_dict(self) -> dict:
         """Convert session to dictionary"""
         return {
             "session_id": self.session_id,
-            "state": self.state,
-            "triage_level": self.triage_level.value if self.triage_level else None,
+            "state": self.state.name,
+            "triage_level": _TRIAGE_LABELS[self.triage_level] if self.triage_level else None,
             "recommendation": self.recommendation,
-            "protocol_steps": self.protocol_steps
+            "final_message": self.final_message,
+            "protocol_steps": self.materialize_steps()
         }
 
 
+def _copy_report_value(value):
+    """Shallow-copy a list or dict from an agent report; other values pass through"""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
 class MedicalTriageGuide:
     """
     Workflow guide for medical triage.
@@ -85,7 +243,7 @@ class MedicalTriageGuide:
     """
     
     # Red flag symptoms (require immediate escalation)
-    RED_FLAGS = [
+    RED_FLAGS = frozenset({
         "severe chest pain",
         "difficulty breathing",
         "loss of consciousness",
@@ -94,10 +252,59 @@ class MedicalTriageGuide:
         "severe allergic reaction",
         "poisoning",
         "severe head injury"
-    ]
+    })
+    
+    # Next steps shown to the patient for each triage level
+    _NEXT_STEPS = {
+        TriageLevel.IMMEDIATE: "Call 911 or go to Emergency Department IMMEDIATELY",
+        TriageLevel.EMERGENCY: "Go to Emergency Department within 10 minutes",
+        TriageLevel.URGENT: "Visit Urgent Care or ED within 30 minutes",
+        TriageLevel.SEMI_URGENT: "Visit Urgent Care within 1 hour",
+        TriageLevel.NON_URGENT: "Schedule appointment with primary care or use telehealth within 24 hours"
+    }
+    
+    # (triage level, recommendation) by severity score 0..5+
+    _SEVERITY_TABLE = (
+        (TriageLevel.NON_URGENT, "Primary care or telehealth - within 24 hours"),
+        (TriageLevel.NON_URGENT, "Primary care or telehealth - within 24 hours"),
+        (TriageLevel.SEMI_URGENT, "Urgent Care - within 60 minutes"),
+        (TriageLevel.URGENT, "Urgent Care or ED - within 30 minutes"),
+        (TriageLevel.URGENT, "Urgent Care or ED - within 30 minutes"),
+        (TriageLevel.EMERGENCY, "Emergency Department - within 10 minutes")
+    )
+    
+    # Recommendation for each level reachable from the table
+    _RECOMMENDATIONS = dict(_SEVERITY_TABLE)
+    
+    # Session retention: past MAX_SESSIONS, completed sessions are evicted
+    # first and then the least recently used; sessions are also pruned
+    # COMPLETED_RETENTION_NS after they complete
+    MAX_SESSIONS = 10_000
+    COMPLETED_RETENTION_NS = 30 * 60 * 1_000_000_000  # 30 minutes
+    
+    # Sessions are split across shards so concurrent inserts and evictions
+    # for different sessions do not contend on one lock
+    SESSION_SHARDS = 16
     
     def __init__(self):
-        self.sessions: Dict[str, TriageSession] = {}
+        self._shards: List[OrderedDict[str, TriageSession]] = [
+            OrderedDict() for _ in range(self.SESSION_SHARDS)
+        ]
+        self._shard_locks = [threading.Lock() for _ in range(self.SESSION_SHARDS)]
+        
+        # Completion time per completed session, oldest first
+        self._completed: OrderedDict[str, int] = OrderedDict()
+        self._completed_lock = threading.Lock()
+        
+        # Protocol step handlers; states without one are not resumable
+        self._handlers = {
+            TriageState.RED_FLAG_SCREENING: self._handle_red_flag_screening,
+            TriageState.CHIEF_COMPLAINT: self._handle_chief_complaint,
+            TriageState.MEDICAL_HISTORY: self._handle_medical_history,
+            TriageState.VITAL_SIGNS: self._handle_vital_signs,
+            TriageState.SEVERITY_ASSESSMENT: self._handle_severity_assessment,
+            TriageState.SAVE_RECORD: self._handle_save_record,
+        }
     
     def start_triage(self) -> dict:
         """
@@ -105,33 +312,21 @@ class MedicalTriageGuide:
         
         Returns instructions for the agent on what to do first.
         """
-        session_id = str(uuid.uuid4())[:8]
-        session = TriageSession(session_id=session_id, state="RED_FLAG_SCREENING")
-        self.sessions[session_id] = session
+        self._prune_completed()
+        self._make_room()
+        
+        while True:
+            session_id = secrets.token_hex(4)
+            shard, lock = self._shard(session_id)
+            with lock:
+                if session_id not in shard:
+                    session = TriageSession(session_id=session_id, state=TriageState.RED_FLAG_SCREENING)
+                    shard[session_id] = session
+                    break
         
         session.add_step("triage_started", {"session_id": session_id})
         
-        return {
-            "status": "in_progress",
-            "session_id": session_id,
-            "task": "screen_red_flags",
-            "instructions_for_agent": (
-                "CRITICAL: Before anything else, screen for emergency symptoms. This is mandatory protocol."
-            ),
-            "prompt": (
-                "Before we begin, I need to ask about any immediate concerns:\n\n"
-                "Are you experiencing any of the following RIGHT NOW:\n"
-                "- Severe chest pain or pressure\n"
-                "- Difficulty breathing or shortness of breath\n"
-                "- Loss of consciousness or fainting\n"
-                "- Severe bleeding\n"
-                "- Signs of stroke (face drooping, arm weakness, speech difficulty)\n"
-                "- Severe allergic reaction (swelling, difficulty swallowing)\n\n"
-                "Please answer yes or no, and describe any symptoms."
-            ),
-            "required_data": ["symptoms_present", "symptom_details"],
-            "protocol": "Emergency Department Triage Protocol - Red Flag Screening (Mandatory)"
-        }
+        return {**_RED_FLAG_SCREENING_RESPONSE, "session_id": session_id}
     
     def continue_triage(self, session_id: str, agent_report: dict) -> dict:
         """
@@ -147,38 +342,22 @@ class MedicalTriageGuide:
                 - For vitals: {"vitals": {...}, "critical_values": [...]}
                 - etc.
         """
-        if session_id not in self.sessions:
+        session = self._touch_session(session_id)
+        if session is None:
             return {
-                "status": "error",
+                "status": STATUS_ERROR,
                 "message": f"Session {session_id} not found. Please start a new triage."
             }
         
-        session = self.sessions[session_id]
-        
         # State machine - protocol enforcement
-        if session.state == "RED_FLAG_SCREENING":
-            return self._handle_red_flag_screening(session, agent_report)
-        
-        elif session.state == "CHIEF_COMPLAINT":
-            return self._handle_chief_complaint(session, agent_report)
-        
-        elif session.state == "MEDICAL_HISTORY":
-            return self._handle_medical_history(session, agent_report)
-        
-        elif session.state == "VITAL_SIGNS":
-            return self._handle_vital_signs(session, agent_report)
-        
-        elif session.state == "SEVERITY_ASSESSMENT":
-            return self._handle_severity_assessment(session, agent_report)
-        
-        elif session.state == "SAVE_RECORD":
-            return self._handle_save_record(session, agent_report)
-        
-        else:
+        handler = self._handlers.get(session.state)
+        if handler is None:
             return {
-                "status": "error",
-                "message": f"Unknown state: {session.state}"
+                "status": STATUS_ERROR,
+                "message": f"Unknown state: {session.state.name}"
             }
+        
+        return handler(session, agent_report)
     
     def _handle_red_flag_screening(self, session: TriageSession, report: dict) -> dict:
         """Handle red flag screening results"""
@@ -202,26 +381,26 @@ class MedicalTriageGuide:
         if requires_emergency:
             session.has_red_flags = True
             session.red_flag_details = detected_red_flags
-            session.state = "EMERGENCY_ESCALATION"
+            session.state = TriageState.EMERGENCY_ESCALATION
             session.triage_level = TriageLevel.IMMEDIATE
             session.recommendation = "IMMEDIATE EMERGENCY CARE REQUIRED"
             
             # Log the decision in audit trail
             session.add_step("emergency_escalation_activated", {
-                "decision": "EMERGENCY_ESCALATION",
-                "triage_level": TriageLevel.IMMEDIATE.value,
+                "decision": DECISION_EMERGENCY_ESCALATION,
+                "triage_level": _TRIAGE_LABELS[TriageLevel.IMMEDIATE],
                 "red_flags": detected_red_flags,
                 "reason": "Critical symptoms detected by classifier"
             })
             
             # Move to record saving state
-            session.state = "SAVE_RECORD"
+            session.state = TriageState.SAVE_RECORD
             
             return {
-                "status": "emergency_save_required",
+                "status": STATUS_EMERGENCY_SAVE_REQUIRED,
                 "session_id": session.session_id,
-                "decision": "EMERGENCY_ESCALATION",
-                "triage_level": TriageLevel.IMMEDIATE.value,
+                "decision": DECISION_EMERGENCY_ESCALATION,
+                "triage_level": _TRIAGE_LABELS[TriageLevel.IMMEDIATE],
                 "red_flags_detected": detected_red_flags,
                 "task": "save_triage_record",
                 "instructions_for_agent": (
@@ -231,89 +410,57 @@ class MedicalTriageGuide:
                     "patient_id": report.get("medical_history", {}).get("patient_id", "P001"),
                     "complaint": report.get("patient_statement", ""),
                     "severity": classification.get("severity", "critical"),
-                    "triage_level": TriageLevel.IMMEDIATE.value,
+                    "triage_level": _TRIAGE_LABELS[TriageLevel.IMMEDIATE],
                     "red_flags": detected_red_flags
                 },
-                "protocol": "Emergency Escalation Protocol - Record Saving",
-                "audit_trail": session.protocol_steps,
-                "emergency_message": (
-                    "🚨 EMERGENCY: Based on your symptoms, you need immediate medical attention.\n\n"
-                    "Please do ONE of the following RIGHT NOW:\n"
-                    "1. Call 911 (or your local emergency number)\n"
-                    "2. Go to the nearest Emergency Department\n"
-                    "3. If with someone, have them drive you to the ER\n\n"
-                    "Do NOT wait. Do NOT drive yourself if symptoms worsen."
-                )
+                "protocol": PROTOCOL_EMERGENCY_RECORD,
+                "audit_trail": session.materialize_steps(),
+                "emergency_message": EMERGENCY_MESSAGE
             }
         
         # No red flags - continue with standard protocol
-        session.state = "CHIEF_COMPLAINT"
+        session.state = TriageState.CHIEF_COMPLAINT
         session.add_step("red_flag_screening_passed", {"result": "no_red_flags"})
         
-        return {
-            "status": "in_progress",
-            "session_id": session.session_id,
-            "task": "gather_chief_complaint",
-            "instructions_for_agent": (
-                "Red flag screening passed. Now gather the chief complaint. "
-                "Ask the patient what brought them in today."
-            ),
-            "prompt": "Thank you. Now, what brings you in today? What is the main issue you're experiencing?",
-            "required_data": ["chief_complaint", "symptom_description"],
-            "protocol": "Standard Triage - Chief Complaint"
-        }
+        return {**_CHIEF_COMPLAINT_RESPONSE, "session_id": session.session_id}
     
     def _handle_chief_complaint(self, session: TriageSession, report: dict) -> dict:
         """Handle chief complaint gathering"""
         session.chief_complaint = report.get("chief_complaint", "")
-        session.add_step("chief_complaint_gathered", report)
+        # Log the fields this step requires, not the agent's whole report
+        session.add_step("chief_complaint_gathered", {
+            "chief_complaint": session.chief_complaint,
+            "symptom_description": _copy_report_value(report.get("symptom_description"))
+        })
         
-        session.state = "MEDICAL_HISTORY"
+        session.state = TriageState.MEDICAL_HISTORY
         
-        return {
-            "status": "in_progress",
-            "session_id": session.session_id,
-            "task": "check_medical_history",
-            "instructions_for_agent": (
-                "Use available tools to check patient's medical history. "
-                "Look for: chronic conditions, medications, allergies, previous similar episodes. "
-                "This helps assess risk factors."
-            ),
-            "prompt": "I'm checking your medical history. Do you have any chronic conditions, take any medications, or have any allergies I should know about?",
-            "required_data": ["medical_history", "medications", "allergies"],
-            "protocol": "Standard Triage - Medical History Review"
-        }
+        return {**_MEDICAL_HISTORY_RESPONSE, "session_id": session.session_id}
     
     def _handle_medical_history(self, session: TriageSession, report: dict) -> dict:
         """Handle medical history check"""
-        session.medical_history = report.get("medical_history", {})
-        session.add_step("medical_history_checked", report)
+        # Copy so the session does not keep the agent's report alive
+        session.medical_history = _copy_report_value(report.get("medical_history") or {})
+        high_risk_conditions = _copy_report_value(report.get("high_risk_conditions") or [])
+        session.add_step("medical_history_checked", {
+            "medical_history": session.medical_history,
+            "high_risk_conditions": high_risk_conditions,
+            "medications": _copy_report_value(report.get("medications") or []),
+            "allergies": _copy_report_value(report.get("allergies") or [])
+        })
         
         # Check if history increases urgency
-        high_risk_conditions = report.get("high_risk_conditions", [])
         if high_risk_conditions:
             session.severity_score += 2
         
-        session.state = "VITAL_SIGNS"
+        session.state = TriageState.VITAL_SIGNS
         
-        return {
-            "status": "in_progress",
-            "session_id": session.session_id,
-            "task": "get_vital_signs",
-            "instructions_for_agent": (
-                "MANDATORY: Obtain vital signs. Use available monitoring tools. "
-                "Required: Blood pressure, heart rate, temperature, respiratory rate, oxygen saturation. "
-                "Flag any critical values immediately."
-            ),
-            "prompt": "Now I need to check your vital signs. This is a required step for proper assessment.",
-            "required_data": ["blood_pressure", "heart_rate", "temperature", "respiratory_rate", "oxygen_saturation"],
-            "protocol": "Standard Triage - Vital Signs (Mandatory)"
-        }
+        return {**_VITAL_SIGNS_RESPONSE, "session_id": session.session_id}
     
     def _handle_vital_signs(self, session: TriageSession, report: dict) -> dict:
         """Handle vital signs assessment"""
-        vitals = report.get("vitals", {})
-        critical_values = report.get("critical_values", [])
+        vitals = _copy_report_value(report.get("vitals") or {})
+        critical_values = _copy_report_value(report.get("critical_values") or [])
         
         session.vitals = vitals
         session.vitals_critical = len(critical_values) > 0
@@ -326,10 +473,10 @@ class MedicalTriageGuide:
         if critical_values:
             session.severity_score += 3
         
-        session.state = "SEVERITY_ASSESSMENT"
+        session.state = TriageState.SEVERITY_ASSESSMENT
         
         return {
-            "status": "in_progress",
+            "status": STATUS_IN_PROGRESS,
             "session_id": session.session_id,
             "task": "assess_severity",
             "instructions_for_agent": (
@@ -343,45 +490,40 @@ class MedicalTriageGuide:
                 "vitals": session.vitals,
                 "severity_score": session.severity_score
             },
-            "protocol": "Final Triage Assessment"
+            "protocol": PROTOCOL_FINAL_ASSESSMENT
         }
     
     def _handle_severity_assessment(self, session: TriageSession, report: dict) -> dict:
         """Handle final severity assessment and recommendation"""
-        # Use severity score to determine triage level
-        if session.severity_score >= 5 or session.vitals_critical:
-            session.triage_level = TriageLevel.EMERGENCY
-            session.recommendation = "Emergency Department - within 10 minutes"
-        elif session.severity_score >= 3:
-            session.triage_level = TriageLevel.URGENT
-            session.recommendation = "Urgent Care or ED - within 30 minutes"
-        elif session.severity_score >= 2:
-            session.triage_level = TriageLevel.SEMI_URGENT
-            session.recommendation = "Urgent Care - within 60 minutes"
+        # Critical vitals always mean EMERGENCY; otherwise the severity
+        # score (capped at 5) indexes straight into the triage table
+        if session.vitals_critical:
+            assessment = self._SEVERITY_TABLE[-1]
         else:
-            session.triage_level = TriageLevel.NON_URGENT
-            session.recommendation = "Primary care or telehealth - within 24 hours"
+            assessment = self._SEVERITY_TABLE[max(0, min(session.severity_score, 5))]
+        session.triage_level, session.recommendation = assessment
         
         session.add_step("triage_completed", {
-            "triage_level": session.triage_level.value,
+            "triage_level": _TRIAGE_LABELS[session.triage_level],
             "recommendation": session.recommendation
         })
         
-        session.state = "COMPLETE"
+        self._mark_complete(session)
+        session.final_message = self._generate_final_message(session)
         
         return {
-            "status": "complete",
+            "status": STATUS_COMPLETE,
             "session_id": session.session_id,
-            "triage_level": session.triage_level.value,
+            "triage_level": _TRIAGE_LABELS[session.triage_level],
             "recommendation": session.recommendation,
-            "message": self._generate_final_message(session),
+            "message": session.final_message,
             "protocol_compliance": {
                 "all_steps_completed": True,
                 "red_flags_screened": session.red_flags_checked,
                 "vitals_obtained": bool(session.vitals),
                 "history_reviewed": bool(session.medical_history)
             },
-            "audit_trail": session.protocol_steps
+            "audit_trail": session.materialize_steps()
         }
     
     def _handle_save_record(self, session: TriageSession, report: dict) -> dict:
@@ -393,80 +535,151 @@ class MedicalTriageGuide:
         })
         
         # Complete the emergency escalation
-        session.state = "COMPLETE"
+        self._mark_complete(session)
         
         return {
-            "status": "emergency",
+            "status": STATUS_EMERGENCY,
             "session_id": session.session_id,
-            "decision": "EMERGENCY_ESCALATION",
-            "triage_level": session.triage_level.value,
+            "decision": DECISION_EMERGENCY_ESCALATION,
+            "triage_level": _TRIAGE_LABELS[session.triage_level],
             "red_flags_detected": session.red_flag_details,
             "task": "emergency_response",
             "instructions_for_agent": (
                 "Triage record saved. Emergency protocol complete."
             ),
-            "message": (
-                "🚨 EMERGENCY: Based on your symptoms, you need immediate medical attention.\n\n"
-                "Please do ONE of the following RIGHT NOW:\n"
-                "1. Call 911 (or your local emergency number)\n"
-                "2. Go to the nearest Emergency Department\n"
-                "3. If with someone, have them drive you to the ER\n\n"
-                "Do NOT wait. Do NOT drive yourself if symptoms worsen."
-            ),
-            "protocol": "Emergency Escalation Protocol - Complete",
-            "audit_trail": session.protocol_steps
+            "message": EMERGENCY_MESSAGE,
+            "protocol": PROTOCOL_EMERGENCY_COMPLETE,
+            "audit_trail": session.materialize_steps()
         }
     
     def _generate_final_message(self, session: TriageSession) -> str:
         """Generate final triage message"""
+        template = self._final_message_template(
+            session.triage_level,
+            session.vitals_critical,
+            bool(session.medical_history.get('high_risk'))
+        )
+        return template.format(complaint=session.chief_complaint)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _final_message_template(cls, level: TriageLevel, vitals_critical: bool, high_risk: bool) -> str:
+        """
+        Final triage message with a single {complaint} slot.
+        
+        Label, recommendation and next steps all follow from the level, so
+        there are at most 20 templates; the complaint is never cached.
+        """
         return f"""
 TRIAGE ASSESSMENT COMPLETE
 
-Triage Level: {session.triage_level.value}
-Recommendation: {session.recommendation}
+Triage Level: {_TRIAGE_LABELS[level]}
+Recommendation: {cls._RECOMMENDATIONS[level]}
 
 Based on:
-- Symptoms: {session.chief_complaint}
-- Vital signs: {'Critical values detected' if session.vitals_critical else 'Within normal limits'}
-- Medical history: {'Risk factors present' if session.medical_history.get('high_risk') else 'Reviewed'}
+- Symptoms: {{complaint}}
+- Vital signs: {'Critical values detected' if vitals_critical else 'Within normal limits'}
+- Medical history: {'Risk factors present' if high_risk else 'Reviewed'}
 
 Next Steps:
-{self._get_next_steps(session.triage_level)}
+{cls._NEXT_STEPS[level]}
 
 ⚠️ If symptoms worsen or new severe symptoms develop, seek emergency care immediately.
 
 Protocol Compliance: All required steps completed ✓
-        """.strip()
-    
-    def _get_next_steps(self, level: TriageLevel) -> str:
-        """Get next steps based on triage level"""
-        if level == TriageLevel.IMMEDIATE:
-            return "Call 911 or go to Emergency Department IMMEDIATELY"
-        elif level == TriageLevel.EMERGENCY:
-            return "Go to Emergency Department within 10 minutes"
-        elif level == TriageLevel.URGENT:
-            return "Visit Urgent Care or ED within 30 minutes"
-        elif level == TriageLevel.SEMI_URGENT:
-            return "Visit Urgent Care within 1 hour"
-        else:
-            return "Schedule appointment with primary care or use telehealth within 24 hours"
+    """.strip()
+    
+    def _shard(self, session_id: str) -> Tuple["OrderedDict[str, TriageSession]", threading.Lock]:
+        """Return the shard holding `session_id` and the lock guarding it"""
+        index = hash(session_id) % self.SESSION_SHARDS
+        return self._shards[index], self._shard_locks[index]
+    
+    def _touch_session(self, session_id: str) -> Optional[TriageSession]:
+        """
+        Look up a session and mark it as most recently used.
+        
+        Each OrderedDict call is atomic under the GIL, so lookups skip the
+        shard lock; only multi-step updates (insert, evict) take it.
+        """
+        shard = self._shards[hash(session_id) % self.SESSION_SHARDS]
+        session = shard.get(session_id)
+        if session is not None:
+            try:
+                shard.move_to_end(session_id)
+            except KeyError:  # evicted or cancelled concurrently
+                pass
+        return session
+    
+    def _remove_session(self, session_id: str):
+        """Remove a session from its shard, if still present"""
+        shard, lock = self._shard(session_id)
+        with lock:
+            shard.pop(session_id, None)
+    
+    def _mark_complete(self, session: TriageSession):
+        """Move a session to COMPLETE and start its retention period"""
+        session.state = TriageState.COMPLETE
+        with self._completed_lock:
+            self._completed[session.session_id] = time.time_ns()
+    
+    def _prune_completed(self):
+        """
+        Drop sessions that completed more than COMPLETED_RETENTION_NS ago.
+        
+        Completion times are kept oldest first, so this stops at the first
+        session still within retention and costs one peek when none expired.
+        """
+        cutoff_ns = time.time_ns() - self.COMPLETED_RETENTION_NS
+        while True:
+            with self._completed_lock:
+                if not self._completed:
+                    return
+                session_id, completed_at_ns = next(iter(self._completed.items()))
+                if completed_at_ns >= cutoff_ns:
+                    return
+                del self._completed[session_id]
+            self._remove_session(session_id)
+    
+    def _make_room(self):
+        """
+        Evict sessions while the guide holds MAX_SESSIONS in total.
+        
+        Completed sessions go first, oldest completion first. Only when
+        none are left is an in-progress session evicted: the least
+        recently used one in the fullest shard.
+        """
+        while sum(map(len, self._shards)) >= self.MAX_SESSIONS:
+            with self._completed_lock:
+                session_id = self._completed.popitem(last=False)[0] if self._completed else None
+            if session_id is not None:
+                self._remove_session(session_id)
+                continue
+            index = max(range(self.SESSION_SHARDS), key=lambda i: len(self._shards[i]))
+            with self._shard_locks[index]:
+                if self._shards[index]:
+                    self._shards[index].popitem(last=False)
     
     def get_session(self, session_id: str) -> Optional[dict]:
         """Get current session state"""
-        if session_id in self.sessions:
-            return self.sessions[session_id].to_dict()
+        session = self._touch_session(session_id)
+        if session is not None:
+            return session.to_dict()
         return None
     
     def cancel_session(self, session_id: str) -> dict:
         """Cancel a triage session"""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        shard, lock = self._shard(session_id)
+        with lock:
+            session = shard.pop(session_id, None)
+        with self._completed_lock:
+            self._completed.pop(session_id, None)
+        if session is not None:
             return {
-                "status": "cancelled",
+                "status": STATUS_CANCELLED,
                 "message": "Triage session cancelled."
             }
         return {
-            "status": "error",
+            "status": STATUS_ERROR,
             "message": f"Session {session_id} not found."
         }
 